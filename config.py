@@ -1,21 +1,34 @@
 """Configuration constants for hand-mouse."""
 
-import Quartz
+import functools
+
 
 # --- Screen ---
-SCREEN_W = Quartz.CGDisplayPixelsWide(Quartz.CGMainDisplayID())
-SCREEN_H = Quartz.CGDisplayPixelsHigh(Quartz.CGMainDisplayID())
+@functools.cache
+def screen_size():
+    """Main display (width, height) in pixels, queried from CoreGraphics on first use."""
+    import Quartz
+
+    display = Quartz.CGMainDisplayID()
+    return Quartz.CGDisplayPixelsWide(display), Quartz.CGDisplayPixelsHigh(display)
+
 
 # --- Camera ---
 CAMERA_INDEX = 0
 CAMERA_W = 640
 CAMERA_H = 480
 CAMERA_FAIL_LIMIT = 30  # Consecutive failed reads before declaring disconnect
+CAMERA_FOURCC = "MJPG"  # Compressed USB transfer; ignored by backends that can't set it
+CAMERA_BUFFER_SIZE = 1  # Keep the driver queue short so frames are never stale
 
 # --- MediaPipe ---
+MP_MODEL_FILE = "hand_landmarker.task"  # Relative to app dir; swap in a quantized (INT8) bundle here
 MP_MAX_HANDS = 1
 MP_DETECTION_CONFIDENCE = 0.7
+MP_PRESENCE_CONFIDENCE = 0.5    # Below this, palm detection re-runs instead of tracking
 MP_TRACKING_CONFIDENCE = 0.7
+MP_INPUT_W = 320                 # Frames are downscaled to this before inference; the landmark
+MP_INPUT_H = 240                 # stage crops the hand from it, so check pinch accuracy before shrinking
 
 # --- Coordinate mapping ---
 MARGIN_X = 0.1
@@ -49,7 +62,9 @@ SCROLL_MOMENTUM_MIN = 0.01     # Stop when momentum drops below this
 # --- Hotkey ---
 HOTKEY_MODIFIERS = {"ctrl", "shift"}
 HOTKEY_KEY = "h"
+HOTKEY_QUIT_KEY = "q"           # Same modifiers + this key quits (works without the debug window)
 
 # --- Debug window ---
 DEBUG_WINDOW = True
 DEBUG_WINDOW_NAME = "Hand Mouse Debug"
+DEBUG_TEXT_INTERVAL = 6         # Rebuild overlay text every N frames
@@ -3,12 +3,39 @@
 States: IDLE, MOVING, LEFT_CLICK, RIGHT_CLICK, DRAGGING, DRAG_END, SCROLLING, SWIPING
 """
 
-import math
 import time
 from enum import Enum, auto
 
+import numpy as np
+
 import config
-from hand_tracker import HandTracker
+from gesture_kernel import (
+    POSE_INDEX, POSE_MIDDLE, POSE_RING, POSE_PINKY, POSE_THUMB, extract_features, warm_up,
+)
+
+# Hand poses (see gesture_kernel for the bit layout)
+POSE_MOVE = POSE_INDEX
+POSE_SCROLL = POSE_INDEX | POSE_MIDDLE
+POSE_OPEN = POSE_INDEX | POSE_MIDDLE | POSE_RING | POSE_PINKY | POSE_THUMB
+_FINGER_MASK = POSE_OPEN & ~POSE_THUMB
+
+# Cooldowns as integer nanoseconds for time.monotonic_ns() comparisons
+_CLICK_COOLDOWN_NS = int(config.CLICK_COOLDOWN * 1e9)
+_SWIPE_COOLDOWN_NS = int(config.SWIPE_COOLDOWN * 1e9)
+_MIN_SWIPE_DT_NS = 5_000_000
+
+# Hot-path thresholds bound at import so update() skips the config attribute lookups
+_DRAG_PINCH_THRESHOLD = config.DRAG_PINCH_THRESHOLD
+_DRAG_RELEASE_THRESHOLD = config.DRAG_RELEASE_THRESHOLD
+_THUMB_CROSS_THRESHOLD = config.THUMB_CROSS_THRESHOLD
+_THUMB_CROSS_RELEASE = config.THUMB_CROSS_RELEASE
+_PINCH_THRESHOLD = config.PINCH_THRESHOLD
+_PINCH_RELEASE_THRESHOLD = config.PINCH_RELEASE_THRESHOLD
+_SCROLL_SPEED = config.SCROLL_SPEED
+_SWIPE_VELOCITY_THRESHOLD = config.SWIPE_VELOCITY_THRESHOLD
+_SWIPE_MIN_DISTANCE = config.SWIPE_MIN_DISTANCE
+_SCROLL_MOMENTUM_DECAY = config.SCROLL_MOMENTUM_DECAY
+_SCROLL_MOMENTUM_MIN = config.SCROLL_MOMENTUM_MIN
 
 
 class Gesture(Enum):
@@ -23,11 +50,21 @@ class Gesture(Enum):
     SWIPE_RIGHT = auto()
 
 
+class GestureData:
+    """Per-frame gesture payload. One instance is reused, so read it before the next update()."""
+    __slots__ = ("x", "y", "dy")
+
+    def __init__(self, x=0.0, y=0.0, dy=0.0):
+        self.x = x
+        self.y = y
+        self.dy = dy
+
+
 class GestureEngine:
     def __init__(self):
         self.state = Gesture.IDLE
-        self.last_click_time = 0.0
-        self.last_swipe_time = 0.0
+        self.last_click_time = 0  # monotonic ns
+        self.last_swipe_time = 0
         self.scroll_anchor_y = None
         self.scroll_momentum = 0.0
         self.prev_x = None
@@ -37,7 +74,9 @@ class GestureEngine:
         # Click hysteresis: track whether pinch was released since last click
         self.left_click_armed = True
         self.right_click_armed = True
-        # Debug info (updated each frame)
+        self._out = GestureData()
+        # Debug info (updated each frame, only when the debug window shows it)
+        self._debug_enabled = config.DEBUG_WINDOW
         self.debug = {
             "thumb_cross": 0.0,
             "thumb_middle": 0.0,
@@ -45,6 +84,8 @@ class GestureEngine:
             "fingers": [False, False, False, False],
             "scroll_dy": 0.0,
         }
+        # Compile (or load cached) the feature kernel before the first frame
+        warm_up()
 
     def reset(self):
         """Reset all gesture state (call on toggle/disconnect)."""
@@ -58,131 +99,113 @@ class GestureEngine:
         self.left_click_armed = True
         self.right_click_armed = True
 
-    @staticmethod
-    def _dist(a, b):
-        return math.sqrt((a.x - b.x) ** 2 + (a.y - b.y) ** 2 + (a.z - b.z) ** 2)
-
-    @staticmethod
-    def _dist_2d(a, b):
-        return math.sqrt((a.x - b.x) ** 2 + (a.y - b.y) ** 2)
-
-    def _is_finger_extended(self, lm, tip, pip):
-        wrist = lm[HandTracker.WRIST]
-        return self._dist(lm[tip], wrist) > self._dist(lm[pip], wrist)
-
-    def _fingers_extended(self, lm):
-        return [
-            self._is_finger_extended(lm, HandTracker.INDEX_TIP, HandTracker.INDEX_PIP),
-            self._is_finger_extended(lm, HandTracker.MIDDLE_TIP, HandTracker.MIDDLE_PIP),
-            self._is_finger_extended(lm, HandTracker.RING_TIP, HandTracker.RING_PIP),
-            self._is_finger_extended(lm, HandTracker.PINKY_TIP, HandTracker.PINKY_PIP),
-        ]
-
-    def _is_thumb_extended(self, lm):
-        return self._dist(lm[HandTracker.THUMB_TIP], lm[HandTracker.THUMB_MCP]) > \
-               self._dist(lm[HandTracker.THUMB_IP], lm[HandTracker.THUMB_MCP])
-
     def update_momentum(self):
         """Tick momentum scrolling (call every frame, even without hand)."""
-        if abs(self.scroll_momentum) > config.SCROLL_MOMENTUM_MIN:
-            self.scroll_momentum *= config.SCROLL_MOMENTUM_DECAY
+        if abs(self.scroll_momentum) > _SCROLL_MOMENTUM_MIN:
+            self.scroll_momentum *= _SCROLL_MOMENTUM_DECAY
             return self.scroll_momentum
         self.scroll_momentum = 0.0
         return 0.0
 
     def update(self, landmarks):
-        """Analyse landmarks and return (gesture, data_dict)."""
-        now = time.time()
-        lm = landmarks
+        """Analyse a (21, 3) landmark array and return (gesture, GestureData)."""
+        now = time.monotonic_ns()
+        P = landmarks
+        out = self._out
 
         # Validate landmark data (NaN guard)
-        try:
-            _ = lm[0].x + lm[0].y
-        except (TypeError, AttributeError):
+        if P is None or not np.isfinite(P).all():
             self.state = Gesture.IDLE
-            return Gesture.IDLE, {}
-
-        fingers = self._fingers_extended(lm)
-        index_ext, middle_ext, ring_ext, pinky_ext = fingers
-        thumb_ext = self._is_thumb_extended(lm)
-
-        thumb_tip = lm[HandTracker.THUMB_TIP]
-        index_tip = lm[HandTracker.INDEX_TIP]
-        pinky_tip = lm[HandTracker.PINKY_TIP]
-        middle_tip = lm[HandTracker.MIDDLE_TIP]
-
-        # Compute distances once
-        thumb_middle_dist = self._dist_2d(thumb_tip, middle_tip)
-        thumb_pinky_dist = self._dist_2d(thumb_tip, pinky_tip)
+            return Gesture.IDLE, out
 
-        # Left click: thumb cross under palm (thumb tip crosses past index MCP on x-axis)
-        index_mcp = lm[HandTracker.INDEX_MCP]
-        # Thumb crosses when its tip goes past index MCP toward pinky side
-        # In mirrored camera view: thumb tip x > index MCP x means crossed
-        thumb_cross = thumb_tip.x - index_mcp.x
+        (pose, thumb_cross, thumb_middle_dist, thumb_pinky_dist,
+         wrist_x, index_x, index_y, middle_y) = extract_features(P)
+        finger_pose = pose & _FINGER_MASK  # Thumb ignored
 
         # Update debug info
-        self.debug["thumb_cross"] = thumb_cross
-        self.debug["thumb_middle"] = thumb_middle_dist
-        self.debug["thumb_pinky"] = thumb_pinky_dist
-        self.debug["fingers"] = fingers
+        if self._debug_enabled:
+            debug = self.debug
+            debug["thumb_cross"] = thumb_cross
+            debug["thumb_middle"] = thumb_middle_dist
+            debug["thumb_pinky"] = thumb_pinky_dist
+            debug["fingers"] = [bool(pose & POSE_INDEX), bool(pose & POSE_MIDDLE),
+                                bool(pose & POSE_RING), bool(pose & POSE_PINKY)]
+
+        # --- Fast path: still pointing, no drag/click trigger in range ---
+        # Previous frame was MOVING (so not dragging and swipe tracking already
+        # cleared); the full cascade below would end in MOVING as well.
+        if (finger_pose == POSE_MOVE and self.state == Gesture.MOVING
+                and thumb_middle_dist >= _DRAG_PINCH_THRESHOLD
+                and thumb_cross <= _THUMB_CROSS_THRESHOLD
+                and thumb_pinky_dist >= _PINCH_THRESHOLD):
+            if thumb_cross < -_THUMB_CROSS_RELEASE:
+                self.left_click_armed = True
+            if thumb_pinky_dist > _PINCH_RELEASE_THRESHOLD:
+                self.right_click_armed = True
+            out.x, out.y = index_x, index_y
+            return Gesture.MOVING, out
 
         # --- Drag: thumb-middle pinch (hold left mouse button) ---
         if self.dragging:
-            if thumb_middle_dist > config.DRAG_RELEASE_THRESHOLD:
+            if thumb_middle_dist > _DRAG_RELEASE_THRESHOLD:
                 self.dragging = False
                 self.state = Gesture.DRAG_END
-                return Gesture.DRAG_END, {}
+                return Gesture.DRAG_END, out
             else:
                 self.state = Gesture.DRAGGING
-                return Gesture.DRAGGING, {"x": index_tip.x, "y": index_tip.y}
+                out.x, out.y = index_x, index_y
+                return Gesture.DRAGGING, out
 
-        if thumb_middle_dist < config.DRAG_PINCH_THRESHOLD:
+        if thumb_middle_dist < _DRAG_PINCH_THRESHOLD:
             self.dragging = True
             self.state = Gesture.DRAGGING
             self.scroll_anchor_y = None
             self.scroll_momentum = 0.0
-            return Gesture.DRAGGING, {"x": index_tip.x, "y": index_tip.y}
+            out.x, out.y = index_x, index_y
+            return Gesture.DRAGGING, out
 
         # --- Left click: thumb cross under index finger ---
-        if thumb_cross > config.THUMB_CROSS_THRESHOLD:
-            if self.left_click_armed and now - self.last_click_time > config.CLICK_COOLDOWN:
+        if thumb_cross > _THUMB_CROSS_THRESHOLD:
+            if self.left_click_armed and now - self.last_click_time > _CLICK_COOLDOWN_NS:
                 self.last_click_time = now
                 self.left_click_armed = False
                 self.state = Gesture.LEFT_CLICK
                 self.scroll_anchor_y = None
                 self.scroll_momentum = 0.0
-                return Gesture.LEFT_CLICK, {}
-        elif thumb_cross < -config.THUMB_CROSS_RELEASE:
+                return Gesture.LEFT_CLICK, out
+        elif thumb_cross < -_THUMB_CROSS_RELEASE:
             self.left_click_armed = True
 
         # --- Right click: thumb-pinky pinch ---
-        if thumb_pinky_dist < config.PINCH_THRESHOLD:
-            if self.right_click_armed and now - self.last_click_time > config.CLICK_COOLDOWN:
+        if thumb_pinky_dist < _PINCH_THRESHOLD:
+            if self.right_click_armed and now - self.last_click_time > _CLICK_COOLDOWN_NS:
                 self.last_click_time = now
                 self.right_click_armed = False
                 self.state = Gesture.RIGHT_CLICK
                 self.scroll_anchor_y = None
                 self.scroll_momentum = 0.0
-                return Gesture.RIGHT_CLICK, {}
-        elif thumb_pinky_dist > config.PINCH_RELEASE_THRESHOLD:
+                return Gesture.RIGHT_CLICK, out
+        elif thumb_pinky_dist > _PINCH_RELEASE_THRESHOLD:
             self.right_click_armed = True
 
         # --- Scroll: index + middle extended, others curled ---
-        if index_ext and middle_ext and not ring_ext and not pinky_ext:
-            avg_y = (index_tip.y + middle_tip.y) / 2.0
+        if finger_pose == POSE_SCROLL:
+            avg_y = (index_y + middle_y) / 2.0
             if self.scroll_anchor_y is None:
                 self.scroll_anchor_y = avg_y
                 self.state = Gesture.SCROLLING
-                return Gesture.SCROLLING, {"dy": 0}
+                out.dy = 0.0
+                return Gesture.SCROLLING, out
             else:
-                dy = (avg_y - self.scroll_anchor_y) * config.SCROLL_SPEED
+                dy = (avg_y - self.scroll_anchor_y) * _SCROLL_SPEED
                 # Use a moving anchor (smoothed) instead of resetting every frame
                 self.scroll_anchor_y = 0.7 * self.scroll_anchor_y + 0.3 * avg_y
                 self.scroll_momentum = dy  # Feed momentum
-                self.debug["scroll_dy"] = dy
+                if self._debug_enabled:
+                    self.debug["scroll_dy"] = dy
                 self.state = Gesture.SCROLLING
-                return Gesture.SCROLLING, {"dy": dy}
+                out.dy = dy
+                return Gesture.SCROLLING, out
 
         # Don't reset scroll anchor immediately - only after leaving scroll pose
         # for a few frames (handled by the fact that momentum continues)
@@ -190,28 +213,26 @@ class GestureEngine:
             self.scroll_anchor_y = None
 
         # --- Swipe: all fingers extended, fast horizontal + minimum distance ---
-        all_extended = index_ext and middle_ext and ring_ext and pinky_ext and thumb_ext
-        if all_extended:
-            wrist_x = lm[HandTracker.WRIST].x
+        if pose == POSE_OPEN:
             if self.prev_x is not None and self.prev_time is not None:
-                dt = now - self.prev_time
-                if dt > 0.005:  # Ignore tiny dt to avoid velocity spikes
-                    vx = (wrist_x - self.prev_x) / dt
+                dt_ns = now - self.prev_time
+                if dt_ns > _MIN_SWIPE_DT_NS:  # Ignore tiny dt to avoid velocity spikes
+                    vx = (wrist_x - self.prev_x) / (dt_ns * 1e-9)
                     # Check minimum travel distance from swipe start
                     travel = abs(wrist_x - self.swipe_start_x) if self.swipe_start_x is not None else 0
-                    if (abs(vx) > config.SWIPE_VELOCITY_THRESHOLD
-                            and travel > config.SWIPE_MIN_DISTANCE
-                            and now - self.last_swipe_time > config.SWIPE_COOLDOWN):
+                    if (abs(vx) > _SWIPE_VELOCITY_THRESHOLD
+                            and travel > _SWIPE_MIN_DISTANCE
+                            and now - self.last_swipe_time > _SWIPE_COOLDOWN_NS):
                         self.last_swipe_time = now
                         self.prev_x = wrist_x
                         self.prev_time = now
                         self.swipe_start_x = wrist_x  # Reset start for next swipe
                         if vx < 0:
                             self.state = Gesture.SWIPE_LEFT
-                            return Gesture.SWIPE_LEFT, {}
+                            return Gesture.SWIPE_LEFT, out
                         else:
                             self.state = Gesture.SWIPE_RIGHT
-                            return Gesture.SWIPE_RIGHT, {}
+                            return Gesture.SWIPE_RIGHT, out
             else:
                 self.swipe_start_x = wrist_x  # Mark swipe start position
             self.prev_x = wrist_x
@@ -222,10 +243,11 @@ class GestureEngine:
             self.swipe_start_x = None
 
         # --- Move: index extended, others curled ---
-        if index_ext and not middle_ext and not ring_ext and not pinky_ext:
+        if finger_pose == POSE_MOVE:
             self.state = Gesture.MOVING
-            return Gesture.MOVING, {"x": index_tip.x, "y": index_tip.y}
+            out.x, out.y = index_x, index_y
+            return Gesture.MOVING, out
 
         # --- Idle ---
         self.state = Gesture.IDLE
-        return Gesture.IDLE, {}
+        return Gesture.IDLE, out
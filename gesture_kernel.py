@@ -0,0 +1,72 @@
+"""Numba-compiled per-frame gesture feature extraction.
+
+Only the arithmetic lives here; the gesture state machine stays in Python.
+"""
+
+import math
+
+import numpy as np
+from numba import njit
+
+from hand_tracker import HandTracker as _HT
+
+# Landmark indices as module globals (Numba freezes them as compile-time constants)
+WRIST = _HT.WRIST
+THUMB_MCP, THUMB_IP, THUMB_TIP = _HT.THUMB_MCP, _HT.THUMB_IP, _HT.THUMB_TIP
+INDEX_MCP, INDEX_PIP, INDEX_TIP = _HT.INDEX_MCP, _HT.INDEX_PIP, _HT.INDEX_TIP
+MIDDLE_PIP, MIDDLE_TIP = _HT.MIDDLE_PIP, _HT.MIDDLE_TIP
+RING_PIP, RING_TIP = _HT.RING_PIP, _HT.RING_TIP
+PINKY_PIP, PINKY_TIP = _HT.PINKY_PIP, _HT.PINKY_TIP
+
+# Pose bits: one per extended digit, packed into a single int
+POSE_INDEX = 0b10000
+POSE_MIDDLE = 0b01000
+POSE_RING = 0b00100
+POSE_PINKY = 0b00010
+POSE_THUMB = 0b00001
+
+
+@njit(cache=True, fastmath=True)
+def _dist_sq(P, a, b):
+    dx = P[a, 0] - P[b, 0]
+    dy = P[a, 1] - P[b, 1]
+    dz = P[a, 2] - P[b, 2]
+    return dx * dx + dy * dy + dz * dz
+
+
+@njit(cache=True, fastmath=True)
+def extract_features(P):
+    """Compute gesture features from a (21, 3) float32 landmark array.
+
+    Returns (pose, thumb_cross, thumb_middle_dist, thumb_pinky_dist,
+    wrist_x, index_x, index_y, middle_y), where pose is a bitmask of POSE_* bits.
+    """
+    pose = 0
+    # Fingers: tip farther from wrist than PIP, squared distances
+    if _dist_sq(P, INDEX_TIP, WRIST) > _dist_sq(P, INDEX_PIP, WRIST):
+        pose |= POSE_INDEX
+    if _dist_sq(P, MIDDLE_TIP, WRIST) > _dist_sq(P, MIDDLE_PIP, WRIST):
+        pose |= POSE_MIDDLE
+    if _dist_sq(P, RING_TIP, WRIST) > _dist_sq(P, RING_PIP, WRIST):
+        pose |= POSE_RING
+    if _dist_sq(P, PINKY_TIP, WRIST) > _dist_sq(P, PINKY_PIP, WRIST):
+        pose |= POSE_PINKY
+    # Thumb: tip farther from MCP than IP
+    if _dist_sq(P, THUMB_TIP, THUMB_MCP) > _dist_sq(P, THUMB_IP, THUMB_MCP):
+        pose |= POSE_THUMB
+
+    # 2D distances from thumb tip to middle and pinky tips
+    tx, ty = P[THUMB_TIP, 0], P[THUMB_TIP, 1]
+    thumb_middle_dist = math.sqrt((tx - P[MIDDLE_TIP, 0]) ** 2 + (ty - P[MIDDLE_TIP, 1]) ** 2)
+    thumb_pinky_dist = math.sqrt((tx - P[PINKY_TIP, 0]) ** 2 + (ty - P[PINKY_TIP, 1]) ** 2)
+    # Left click: thumb tip past index MCP on the x-axis.
+    # In mirrored camera view: thumb tip x > index MCP x means crossed
+    thumb_cross = tx - P[INDEX_MCP, 0]
+
+    return (pose, thumb_cross, thumb_middle_dist, thumb_pinky_dist,
+            P[WRIST, 0], P[INDEX_TIP, 0], P[INDEX_TIP, 1], P[MIDDLE_TIP, 1])
+
+
+def warm_up():
+    """Trigger compilation (or cache load) before the first real frame."""
+    extract_features(np.zeros((21, 3), dtype=np.float32))
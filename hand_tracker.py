@@ -2,9 +2,10 @@
 
 import os
 import mediapipe as mp
+import numpy as np
 import config
 
-_MODEL_PATH = os.path.join(os.path.dirname(__file__), "hand_landmarker.task")
+_MODEL_PATH = os.path.join(os.path.dirname(__file__), config.MP_MODEL_FILE)
 
 
 class HandTracker:
@@ -16,25 +17,38 @@ class HandTracker:
     RING_MCP, RING_PIP, RING_DIP, RING_TIP = 13, 14, 15, 16
     PINKY_MCP, PINKY_PIP, PINKY_DIP, PINKY_TIP = 17, 18, 19, 20
 
-    def __init__(self):
+    def __init__(self, mirror=False):
+        self.mirror = mirror  # Flip landmark x so an unflipped frame reads like a mirror
         base_options = mp.tasks.BaseOptions(model_asset_path=_MODEL_PATH)
         options = mp.tasks.vision.HandLandmarkerOptions(
             base_options=base_options,
             num_hands=config.MP_MAX_HANDS,
             min_hand_detection_confidence=config.MP_DETECTION_CONFIDENCE,
+            min_hand_presence_confidence=config.MP_PRESENCE_CONFIDENCE,
             min_tracking_confidence=config.MP_TRACKING_CONFIDENCE,
+            # VIDEO mode derives the next frame's ROI from the previous landmarks and
+            # only re-runs palm detection when hand presence drops below the threshold
             running_mode=mp.tasks.vision.RunningMode.VIDEO,
         )
         self.landmarker = mp.tasks.vision.HandLandmarker.create_from_options(options)
         self._frame_ts = 0
 
     def process(self, frame_rgb):
-        """Process an RGB frame. Returns list of 21 NormalizedLandmark or None."""
+        """Process an RGB frame. Returns (21, 3) float32 array of x, y, z or None."""
         mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame_rgb)
         self._frame_ts += 1
         result = self.landmarker.detect_for_video(mp_image, self._frame_ts)
         if result.hand_landmarks:
-            return result.hand_landmarks[0]  # List of 21 NormalizedLandmark
+            # Convert once so consumers index a single array instead of 21 pybind objects.
+            # Kept float32: the whole array is 252 bytes, and Numba has no float16 math
+            # (int16 fixed-point would only add conversions and rescaled thresholds).
+            P = np.fromiter(
+                (v for p in result.hand_landmarks[0] for v in (p.x, p.y, p.z)),
+                dtype=np.float32, count=63,
+            ).reshape(21, 3)
+            if self.mirror:
+                P[:, 0] = 1.0 - P[:, 0]
+            return P
         return None
 
     def close(self):
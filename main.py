@@ -5,6 +5,7 @@ Usage:
 
 Controls:
     Ctrl+Shift+H  - Toggle hand tracking on/off
+    Ctrl+Shift+Q  - Quit
     Q (in debug window) - Quit
 """
 
@@ -12,10 +13,10 @@ import os
 import threading
 import time
 import signal
-from collections import deque
 
 import cv2
-import mediapipe as mp
+import numpy as np
+import Quartz
 
 import config
 from hand_tracker import HandTracker
@@ -24,27 +25,88 @@ from mouse_controller import MouseController
 from one_euro_filter import OneEuroFilter
 
 
+# Skeleton as landmark chains: the same 21 edges as MediaPipe's HAND_CONNECTIONS,
+# grouped so each finger and the palm knuckle line is one polyline
+_HAND_CHAINS = [
+    np.array(chain, dtype=np.int32) for chain in (
+        (0, 1, 2, 3, 4),        # Thumb
+        (0, 5, 6, 7, 8),        # Index
+        (9, 10, 11, 12),        # Middle
+        (13, 14, 15, 16),       # Ring
+        (0, 17, 18, 19, 20),    # Pinky
+        (5, 9, 13, 17),         # Knuckles
+    )
+]
+
+# Hotkey modifier names (config.HOTKEY_MODIFIERS) -> CGEvent flag bits
+_MODIFIER_FLAGS = {
+    "ctrl": Quartz.kCGEventFlagMaskControl,
+    "shift": Quartz.kCGEventFlagMaskShift,
+    "alt": Quartz.kCGEventFlagMaskAlternate,
+    "cmd": Quartz.kCGEventFlagMaskCommand,
+}
+
+# Letter -> virtual key code (Carbon kVK_ANSI_*, US layout positions)
+_ANSI_KEYCODES = {
+    "a": 0x00, "s": 0x01, "d": 0x02, "f": 0x03, "h": 0x04, "g": 0x05, "z": 0x06,
+    "x": 0x07, "c": 0x08, "v": 0x09, "b": 0x0B, "q": 0x0C, "w": 0x0D, "e": 0x0E,
+    "r": 0x0F, "y": 0x10, "t": 0x11, "o": 0x1F, "u": 0x20, "i": 0x22, "p": 0x23,
+    "l": 0x25, "j": 0x26, "k": 0x28, "n": 0x2D, "m": 0x2E,
+}
+
+
 class HandMouse:
     def __init__(self):
         self.active = True
         self.running = True
-        self.tracker = HandTracker()
+        # Frames are fed unflipped; the tracker mirrors landmark x instead
+        self.tracker = HandTracker(mirror=True)
         self.gesture_engine = GestureEngine()
         self.mouse = MouseController()
+        self.screen_w, self.screen_h = config.screen_size()
+        # Margin crop + screen scale folded into one multiply-add per axis
+        self._mx_scale = self.screen_w / (1.0 - 2 * config.MARGIN_X)
+        self._mx_offset = -config.MARGIN_X * self._mx_scale
+        self._my_scale = self.screen_h / (1.0 - 2 * config.MARGIN_Y)
+        self._my_offset = -config.MARGIN_Y * self._my_scale
+        self._sw = float(self.screen_w)
+        self._sh = float(self.screen_h)
         self.filter_x = OneEuroFilter(config.FILTER_MIN_CUTOFF, config.FILTER_BETA, config.FILTER_D_CUTOFF)
         self.filter_y = OneEuroFilter(config.FILTER_MIN_CUTOFF, config.FILTER_BETA, config.FILTER_D_CUTOFF)
-        self.frame_queue = deque(maxlen=1)
+        # Latest (frame, landmarks) from the inference thread; _result_ready signals a new one
+        self._latest_result = None
+        self._result_ready = threading.Event()
+        # Preallocated inference buffers, only touched by the inference thread
+        self._small_buf = np.empty((config.MP_INPUT_H, config.MP_INPUT_W, 3), dtype=np.uint8)
+        self._rgb_buf = np.empty_like(self._small_buf)
         self.camera_ok = True
         # FPS tracking
-        self._fps_time = time.time()
+        self._fps_time = time.monotonic()
         self._fps_count = 0
         self._fps = 0.0
-
-    def _camera_loop(self, cap):
-        """Read frames in a background thread with disconnect detection."""
+        # Landmark -> pixel scale for the debug window, set from the first frame
+        self._px_scale = None
+        # Debug overlay text, rebuilt every DEBUG_TEXT_INTERVAL frames
+        self._overlay_lines = []
+        self._overlay_countdown = 0
+
+    def _inference_loop(self, cap):
+        """Capture and run MediaPipe on camera frames in a background thread.
+
+        grab() blocks until the driver has a new frame and skips decoding;
+        retrieve() decodes only the frame we are about to process. While the
+        main thread has not consumed the previous result, new frames are
+        grabbed and dropped without decoding or inference.
+        Single thread only: HandLandmarker needs monotonically increasing timestamps.
+        """
         fail_count = 0
         while self.running:
-            ret, frame = cap.read()
+            ret = cap.grab()
+            if ret:
+                if self._result_ready.is_set():
+                    fail_count = 0
+                    continue
+                ret, frame = cap.retrieve()
             if not ret:
                 fail_count += 1
                 if fail_count >= config.CAMERA_FAIL_LIMIT:
@@ -54,8 +116,21 @@ class HandMouse:
                 time.sleep(0.01)
                 continue
             fail_count = 0
-            frame = cv2.flip(frame, 1)
-            self.frame_queue.append(frame)
+            landmarks = self.tracker.process(self._preprocess(frame))
+            self._latest_result = (frame, landmarks)
+            self._result_ready.set()
+
+    def _preprocess(self, frame):
+        """Downscale and convert a BGR camera frame to RGB for inference.
+
+        The model resizes internally anyway; full-res is only kept for display.
+        Landmarks are normalized, so downstream math is unaffected.
+        """
+        size = (config.MP_INPUT_W, config.MP_INPUT_H)
+        # Stays on the CPU: a cv2.UMat (OpenCL) path would add a full-frame upload
+        # and a download around two small ops, with no measured win to justify it
+        cv2.resize(frame, size, dst=self._small_buf, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(self._small_buf, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
 
     def _toggle(self):
         """Toggle active state with full state reset."""
@@ -69,33 +144,28 @@ class HandMouse:
         self.mouse.reset()
 
     def _map_to_screen(self, nx, ny):
-        x = (nx - config.MARGIN_X) / (1.0 - 2 * config.MARGIN_X)
-        y = (ny - config.MARGIN_Y) / (1.0 - 2 * config.MARGIN_Y)
-        x = max(0.0, min(1.0, x))
-        y = max(0.0, min(1.0, y))
-        return x * config.SCREEN_W, y * config.SCREEN_H
+        x = nx * self._mx_scale + self._mx_offset
+        y = ny * self._my_scale + self._my_offset
+        # Inline clamps: no min()/max() calls, and always float out
+        x = 0.0 if x < 0.0 else (self._sw if x > self._sw else x)
+        y = 0.0 if y < 0.0 else (self._sh if y > self._sh else y)
+        return x, y
 
     def _draw_landmarks(self, frame, landmarks):
-        h, w, _ = frame.shape
-        for connection in mp.tasks.vision.HandLandmarksConnections.HAND_CONNECTIONS:
-            start = landmarks[connection.start]
-            end = landmarks[connection.end]
-            x1, y1 = int(start.x * w), int(start.y * h)
-            x2, y2 = int(end.x * w), int(end.y * h)
-            cv2.line(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
-        for lm in landmarks:
-            cx, cy = int(lm.x * w), int(lm.y * h)
+        if self._px_scale is None:
+            h, w, _ = frame.shape
+            self._px_scale = np.array((w, h), dtype=np.float32)
+        # One float32 multiply scales every landmark to pixels
+        pts = (landmarks[:, :2] * self._px_scale).astype(np.int32)
+        # All skeleton chains in a single OpenCV call
+        cv2.polylines(frame, [pts[chain] for chain in _HAND_CHAINS], False, (0, 255, 0), 2)
+        # tolist() yields Python ints in one pass, no per-point int() casts
+        for cx, cy in pts.tolist():
             cv2.circle(frame, (cx, cy), 4, (0, 0, 255), -1)
 
-    def _draw_debug_overlay(self, frame):
-        """Draw pinch distances, finger states, and FPS."""
+    def _debug_overlay_lines(self):
+        """Format pinch distances, finger states, and FPS."""
         d = self.gesture_engine.debug
-        h, w, _ = frame.shape
-        y0 = h - 10
-        color = (255, 255, 255)
-        font = cv2.FONT_HERSHEY_SIMPLEX
-        scale = 0.45
-        thick = 1
 
         # Gesture distances with threshold indicators
         tc = d["thumb_cross"]
@@ -113,14 +183,28 @@ class HandMouse:
         ext = " ".join(n for n, e in zip(finger_names, fingers) if e)
         lines.append(f"Ext: {ext if ext else 'none'}")
         lines.append(f"FPS: {self._fps:.0f}")
+        return lines
+
+    def _draw_debug_overlay(self, frame):
+        """Draw the debug text; it is only re-formatted every few frames."""
+        if self._overlay_countdown <= 0:
+            self._overlay_lines = self._debug_overlay_lines()
+            self._overlay_countdown = config.DEBUG_TEXT_INTERVAL
+        self._overlay_countdown -= 1
 
+        lines = self._overlay_lines
+        h, w, _ = frame.shape
+        y0 = h - 10
+        color = (255, 255, 255)
+        font = cv2.FONT_HERSHEY_SIMPLEX
+        scale = 0.45
+        thick = 1
         for i, line in enumerate(lines):
             cv2.putText(frame, line, (10, y0 - (len(lines) - 1 - i) * 18),
                         font, scale, color, thick)
 
-    def _update_fps(self):
+    def _update_fps(self, now):
         self._fps_count += 1
-        now = time.time()
         elapsed = now - self._fps_time
         if elapsed >= 1.0:
             self._fps = self._fps_count / elapsed
@@ -128,52 +212,63 @@ class HandMouse:
             self._fps_time = now
 
     def _start_hotkey_listener(self):
-        from pynput import keyboard
-
-        pressed = set()
-
-        def on_press(key):
-            try:
-                k = key.char.lower() if hasattr(key, "char") and key.char else None
-            except AttributeError:
-                k = None
-
-            if key == keyboard.Key.ctrl_l or key == keyboard.Key.ctrl_r:
-                pressed.add("ctrl")
-            elif key == keyboard.Key.shift or key == keyboard.Key.shift_r:
-                pressed.add("shift")
-            elif k:
-                pressed.add(k)
-
-            if config.HOTKEY_MODIFIERS.issubset(pressed) and config.HOTKEY_KEY in pressed:
-                self._toggle()
-
-        def on_release(key):
-            try:
-                k = key.char.lower() if hasattr(key, "char") and key.char else None
-            except AttributeError:
-                k = None
-
-            if key == keyboard.Key.ctrl_l or key == keyboard.Key.ctrl_r:
-                pressed.discard("ctrl")
-            elif key == keyboard.Key.shift or key == keyboard.Key.shift_r:
-                pressed.discard("shift")
-            elif k:
-                pressed.discard(k)
-
-        listener = keyboard.Listener(on_press=on_press, on_release=on_release)
-        listener.daemon = True
-        listener.start()
+        """Watch for the hotkeys with a listen-only Quartz event tap.
+
+        The tap only subscribes to key-down events, so no Python code runs for
+        key releases or modifier changes.
+        """
+        hotkey_flags = 0
+        for name in config.HOTKEY_MODIFIERS:
+            hotkey_flags |= _MODIFIER_FLAGS[name]
+        toggle_code = _ANSI_KEYCODES[config.HOTKEY_KEY]
+        quit_code = _ANSI_KEYCODES[config.HOTKEY_QUIT_KEY]
+
+        def on_event(proxy, event_type, event, refcon):
+            if event_type == Quartz.kCGEventKeyDown:
+                if (Quartz.CGEventGetFlags(event) & hotkey_flags) == hotkey_flags and \
+                        not Quartz.CGEventGetIntegerValueField(event, Quartz.kCGKeyboardEventAutorepeat):
+                    code = Quartz.CGEventGetIntegerValueField(event, Quartz.kCGKeyboardEventKeycode)
+                    if code == toggle_code:
+                        self._toggle()
+                    elif code == quit_code:
+                        self.running = False
+            elif event_type in (Quartz.kCGEventTapDisabledByTimeout,
+                                Quartz.kCGEventTapDisabledByUserInput):
+                Quartz.CGEventTapEnable(tap, True)
+            return event
+
+        tap = Quartz.CGEventTapCreate(
+            Quartz.kCGSessionEventTap,
+            Quartz.kCGHeadInsertEventTap,
+            Quartz.kCGEventTapOptionListenOnly,
+            Quartz.CGEventMaskBit(Quartz.kCGEventKeyDown),
+            on_event,
+            None,
+        )
+        if tap is None:
+            print("WARNING: Cannot create keyboard event tap, hotkeys disabled.")
+            print("Grant access: System Settings > Privacy & Security > Input Monitoring")
+            return
+        source = Quartz.CFMachPortCreateRunLoopSource(None, tap, 0)
+
+        def run_loop():
+            Quartz.CFRunLoopAddSource(Quartz.CFRunLoopGetCurrent(), source, Quartz.kCFRunLoopCommonModes)
+            Quartz.CGEventTapEnable(tap, True)
+            Quartz.CFRunLoopRun()
+
+        threading.Thread(target=run_loop, daemon=True).start()
 
     def run(self):
         print("Hand Mouse starting...")
-        print(f"Screen: {config.SCREEN_W}x{config.SCREEN_H}")
+        print(f"Screen: {self.screen_w}x{self.screen_h}")
         print("Press Ctrl+Shift+H to toggle tracking")
-        print("Press Q in debug window to quit")
+        print("Press Ctrl+Shift+Q (or Q in debug window) to quit")
 
         cap = cv2.VideoCapture(config.CAMERA_INDEX)
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*config.CAMERA_FOURCC))
         cap.set(cv2.CAP_PROP_FRAME_WIDTH, config.CAMERA_W)
         cap.set(cv2.CAP_PROP_FRAME_HEIGHT, config.CAMERA_H)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, config.CAMERA_BUFFER_SIZE)
 
         if not cap.isOpened():
             print("ERROR: Cannot open camera.")
@@ -182,8 +277,8 @@ class HandMouse:
 
         print("Camera opened successfully.")
 
-        cam_thread = threading.Thread(target=self._camera_loop, args=(cap,), daemon=True)
-        cam_thread.start()
+        infer_thread = threading.Thread(target=self._inference_loop, args=(cap,), daemon=True)
+        infer_thread.start()
 
         self._start_hotkey_listener()
         signal.signal(signal.SIGINT, lambda *_: setattr(self, "running", False))
@@ -194,32 +289,36 @@ class HandMouse:
                 print("Camera lost. Shutting down.")
                 break
 
-            if not self.frame_queue:
+            # Block until inference publishes a result. Wake every 1ms only while
+            # momentum scrolling still needs ticking.
+            timeout = 0.001 if self.gesture_engine.scroll_momentum else 0.1
+            if not self._result_ready.wait(timeout):
                 # Even without frames, tick momentum scrolling
                 if self.active:
                     mom = self.gesture_engine.update_momentum()
                     if mom != 0:
                         self.mouse.scroll(mom)
-                time.sleep(0.001)
                 continue
+            self._result_ready.clear()
+            result, self._latest_result = self._latest_result, None
+            if result is None:  # Already consumed after a set/clear race
+                continue
+            frame, landmarks = result
+            # One monotonic clock read per frame, shared by FPS and both filters
+            now = time.monotonic()
+            self._update_fps(now)
 
-            frame = self.frame_queue.pop()
-            self._update_fps()
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            landmarks = self.tracker.process(frame_rgb)
-
-            if landmarks and self.active:
+            if landmarks is not None and self.active:
                 gesture, data = self.gesture_engine.update(landmarks)
-                now = time.time()
 
                 if gesture == Gesture.MOVING:
-                    sx, sy = self._map_to_screen(data["x"], data["y"])
+                    sx, sy = self._map_to_screen(data.x, data.y)
                     sx = self.filter_x(sx, now)
                     sy = self.filter_y(sy, now)
                     self.mouse.move(sx, sy)
 
                 elif gesture == Gesture.DRAGGING:
-                    sx, sy = self._map_to_screen(data["x"], data["y"])
+                    sx, sy = self._map_to_screen(data.x, data.y)
                     sx = self.filter_x(sx, now)
                     sy = self.filter_y(sy, now)
                     self.mouse.drag_move(sx, sy)
@@ -234,8 +333,8 @@ class HandMouse:
                     self.mouse.right_click()
 
                 elif gesture == Gesture.SCROLLING:
-                    if data["dy"] != 0:
-                        self.mouse.scroll(data["dy"])
+                    if data.dy != 0:
+                        self.mouse.scroll(data.dy)
 
                 elif gesture == Gesture.SWIPE_LEFT:
                     self.mouse.swipe_back()
@@ -250,7 +349,9 @@ class HandMouse:
 
             # Debug overlay
             if config.DEBUG_WINDOW:
-                if landmarks:
+                # Mirror for display only; landmarks are already mirrored
+                frame = cv2.flip(frame, 1)
+                if landmarks is not None:
                     self._draw_landmarks(frame, landmarks)
                     state_text = self.gesture_engine.state.name
                 else:
@@ -262,11 +363,13 @@ class HandMouse:
                 self._draw_debug_overlay(frame)
                 cv2.imshow(config.DEBUG_WINDOW_NAME, frame)
 
-            key = cv2.waitKey(1) & 0xFF
-            if key == ord("q"):
-                break
+                # waitKey pumps the window's events; without a window it is pure delay
+                key = cv2.waitKey(1) & 0xFF
+                if key == ord("q"):
+                    break
 
         self.running = False
+        infer_thread.join(timeout=1.0)
         self.mouse.reset()
         cap.release()
         self.tracker.close()
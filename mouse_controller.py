@@ -2,10 +2,13 @@
 
 import Quartz
 from Quartz import (
+    CGEventCreateKeyboardEvent,
     CGEventCreateMouseEvent,
     CGEventCreateScrollWheelEvent,
     CGEventPost,
+    CGEventSetFlags,
     CGEventSetIntegerValueField,
+    kCGEventFlagMaskCommand,
     kCGEventMouseMoved,
     kCGEventLeftMouseDown,
     kCGEventLeftMouseUp,
@@ -17,21 +20,41 @@ from Quartz import (
     kCGMouseButtonRight,
     kCGScrollEventUnitPixel,
 )
-import subprocess
+
+# Virtual key codes (Carbon kVK_ANSI_*)
+_KEY_LEFT_BRACKET = 0x21
+_KEY_RIGHT_BRACKET = 0x1E
+
+
+def _post_cmd_keystroke(keycode):
+    """Post key down + key up for Cmd+<keycode>."""
+    for key_down in (True, False):
+        event = CGEventCreateKeyboardEvent(None, keycode, key_down)
+        CGEventSetFlags(event, kCGEventFlagMaskCommand)
+        CGEventPost(kCGHIDEventTap, event)
 
 
 class MouseController:
     def __init__(self):
         self._last_pos = (0, 0)
+        self._last_rounded = None  # Last pixel posted by move()
         self._dragging = False
+        self._scroll_accum = 0.0  # Sub-pixel scroll carried to the next call
 
     def reset(self):
         """Release any held buttons and reset state."""
         if self._dragging:
             self.drag_end()
+        self._last_rounded = None  # The cursor may have moved since the last post
+        self._scroll_accum = 0.0
 
     def move(self, x, y):
         """Move the mouse cursor to absolute screen coordinates."""
+        # Skip sub-pixel changes: reposting the same pixel only wakes WindowServer
+        rounded = (int(x), int(y))
+        if rounded == self._last_rounded:
+            return
+        self._last_rounded = rounded
         point = Quartz.CGPoint(x, y)
         event = CGEventCreateMouseEvent(None, kCGEventMouseMoved, point, kCGMouseButtonLeft)
         CGEventPost(kCGHIDEventTap, event)
@@ -55,6 +78,7 @@ class MouseController:
 
     def drag_move(self, x, y):
         """Move while holding left mouse button (drag)."""
+        self._last_rounded = None  # Cursor leaves the last move() pixel
         point = Quartz.CGPoint(x, y)
         if not self._dragging:
             down = CGEventCreateMouseEvent(None, kCGEventLeftMouseDown, point, kCGMouseButtonLeft)
@@ -75,30 +99,23 @@ class MouseController:
 
     def scroll(self, dy):
         """Scroll vertically. Positive dy = scroll down, negative = scroll up."""
-        units = int(-dy * 10)
+        # Accumulate fractional pixels and post only whole ones, so slow momentum
+        # keeps its full distance instead of truncating to zero every frame
+        delta = -dy * 10
+        if delta * self._scroll_accum < 0:
+            self._scroll_accum = 0.0  # Direction reversed: drop the old remainder
+        self._scroll_accum += delta
+        units = int(self._scroll_accum)
         if units == 0:
             return
+        self._scroll_accum -= units
         event = CGEventCreateScrollWheelEvent(None, kCGScrollEventUnitPixel, 1, units)
         CGEventPost(kCGHIDEventTap, event)
 
     def swipe_back(self):
         """Simulate browser back (Cmd+[)."""
-        try:
-            subprocess.run(
-                ["osascript", "-e",
-                 'tell application "System Events" to keystroke "[" using command down'],
-                capture_output=True, timeout=2,
-            )
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
+        _post_cmd_keystroke(_KEY_LEFT_BRACKET)
 
     def swipe_forward(self):
         """Simulate browser forward (Cmd+])."""
-        try:
-            subprocess.run(
-                ["osascript", "-e",
-                 'tell application "System Events" to keystroke "]" using command down'],
-                capture_output=True, timeout=2,
-            )
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
+        _post_cmd_keystroke(_KEY_RIGHT_BRACKET)
@@ -7,6 +7,31 @@ High speed -> light smoothing (reduces lag)
 
 import math
 
+from numba import njit
+
+TWO_PI = 2.0 * math.pi
+
+
+@njit(cache=True, fastmath=True)
+def _alpha(cutoff, te):
+    tau = 1.0 / (TWO_PI * cutoff)
+    return 1.0 / (1.0 + tau / te)
+
+
+@njit(cache=True, fastmath=True)
+def _one_euro_step(x, te, x_prev, dx_prev, min_cutoff, beta, d_cutoff):
+    """One filter update on plain scalars. Returns (x_hat, dx_hat)."""
+    # Derivative estimation
+    a_d = _alpha(d_cutoff, te)
+    dx = (x - x_prev) / te
+    dx_hat = a_d * dx + (1 - a_d) * dx_prev
+
+    # Adaptive cutoff
+    cutoff = min_cutoff + beta * abs(dx_hat)
+    a = _alpha(cutoff, te)
+    x_hat = a * x + (1 - a) * x_prev
+    return x_hat, dx_hat
+
 
 class OneEuroFilter:
     def __init__(self, min_cutoff=1.0, beta=0.007, d_cutoff=1.0):
@@ -16,10 +41,8 @@ class OneEuroFilter:
         self.x_prev = None
         self.dx_prev = 0.0
         self.t_prev = None
-
-    def _alpha(self, cutoff, te):
-        tau = 1.0 / (2.0 * math.pi * cutoff)
-        return 1.0 / (1.0 + tau / te)
+        # Compile (or load cached) the step kernel before the first sample
+        _one_euro_step(0.0, 1.0, 0.0, 0.0, min_cutoff, beta, d_cutoff)
 
     def __call__(self, x, t):
         # NaN/inf guard: reject bad input, return last good value
@@ -36,15 +59,8 @@ class OneEuroFilter:
         if te <= 0:
             return self.x_prev
 
-        # Derivative estimation
-        a_d = self._alpha(self.d_cutoff, te)
-        dx = (x - self.x_prev) / te
-        dx_hat = a_d * dx + (1 - a_d) * self.dx_prev
-
-        # Adaptive cutoff
-        cutoff = self.min_cutoff + self.beta * abs(dx_hat)
-        a = self._alpha(cutoff, te)
-        x_hat = a * x + (1 - a) * self.x_prev
+        x_hat, dx_hat = _one_euro_step(x, te, self.x_prev, self.dx_prev,
+                                       self.min_cutoff, self.beta, self.d_cutoff)
 
         # Guard against NaN propagation from arithmetic
         if math.isnan(x_hat):